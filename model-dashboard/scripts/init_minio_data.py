@@ -14,12 +14,17 @@ Environment variables:
     MINIO_USERNAME: MinIO access key (default: argo)
     MINIO_PASSWORD: MinIO secret key (default: @rgo.password)
     MINIO_BUCKET: Bucket name (default: argo-models)
+    INIT_UPLOAD_CONCURRENCY: Maximum parallel uploads (default: 8)
+    QUIET: Set to 1 to skip the per-model upload lines (default: 0)
 """
 
 import os
 import json
 from io import BytesIO
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+import urllib3
 from minio import Minio
 from minio.error import S3Error
 
@@ -30,6 +35,8 @@ MINIO_PORT = int(os.getenv('MINIO_PORT', '9000'))
 MINIO_USERNAME = os.getenv('MINIO_USERNAME', 'argo')
 MINIO_PASSWORD = os.getenv('MINIO_PASSWORD', '@rgo.password')
 MINIO_BUCKET = os.getenv('MINIO_BUCKET', 'argo-models')
+INIT_UPLOAD_CONCURRENCY = int(os.getenv('INIT_UPLOAD_CONCURRENCY', '8'))
+QUIET = os.getenv('QUIET', '0') == '1'
 
 
 # Sample models data
@@ -226,14 +233,32 @@ SAMPLE_MODELS = [
     }
 ]
 
+# Serialized once at import so uploads only do network I/O
+SAMPLE_PAYLOADS = [
+    (model, json.dumps(model, separators=(',', ':')).encode('utf-8'))
+    for model in SAMPLE_MODELS
+]
+
 
 def init_minio_client() -> Minio:
     """Initialize and return MinIO client."""
+    # Size the connection pool to the upload concurrency so parallel
+    # uploads reuse connections instead of opening and discarding extras
+    http_client = urllib3.PoolManager(
+        timeout=urllib3.Timeout(connect=300, read=300),
+        maxsize=max(10, INIT_UPLOAD_CONCURRENCY),
+        retries=urllib3.Retry(
+            total=5,
+            backoff_factor=0.2,
+            status_forcelist=[500, 502, 503, 504]
+        )
+    )
     return Minio(
         f'{MINIO_HOST}:{MINIO_PORT}',
         access_key=MINIO_USERNAME,
         secret_key=MINIO_PASSWORD,
-        secure=False
+        secure=False,
+        http_client=http_client
     )
 
 
@@ -246,13 +271,12 @@ def ensure_bucket(client: Minio) -> None:
         print(f"✓ Bucket exists: {MINIO_BUCKET}")
 
 
-def upload_model(client: Minio, model: dict) -> None:
-    """Upload a model to MinIO."""
+def upload_model(client: Minio, model: dict, data: bytes) -> None:
+    """Upload a model and its pre-serialized JSON payload to MinIO."""
     network_type = model['network_type']
     name = model['name']
     path = f'{network_type}/{name}'
-    
-    data = json.dumps(model, indent=2).encode('utf-8')
+    enabled = bool(model.get('enabled'))
     
     client.put_object(
         MINIO_BUCKET,
@@ -263,22 +287,26 @@ def upload_model(client: Minio, model: dict) -> None:
         metadata={
             'name': name,
             'network_type': network_type,
-            'enabled': str(model.get('enabled', False)).lower()
+            'enabled': 'true' if enabled else 'false'
         }
     )
     
-    status = "enabled" if model.get('enabled') else "disabled"
-    print(f"  ✓ Uploaded: {path} ({status})")
+    if not QUIET:
+        status = "enabled" if enabled else "disabled"
+        print(f"  ✓ Uploaded: {path} ({status})")
 
 
 def main():
     """Main function to initialize MinIO with test data."""
-    print("\n" + "=" * 60)
-    print("Model Dashboard - MinIO Test Data Initialization")
-    print("=" * 60)
-    print(f"\nMinIO Server: {MINIO_HOST}:{MINIO_PORT}")
-    print(f"Bucket: {MINIO_BUCKET}")
-    print()
+    print("\n".join([
+        "",
+        "=" * 60,
+        "Model Dashboard - MinIO Test Data Initialization",
+        "=" * 60,
+        f"\nMinIO Server: {MINIO_HOST}:{MINIO_PORT}",
+        f"Bucket: {MINIO_BUCKET}",
+        ""
+    ]))
     
     try:
         # Connect to MinIO
@@ -288,27 +316,31 @@ def main():
         # Ensure bucket exists
         ensure_bucket(client)
         
-        # Upload sample models
+        # Upload sample models in parallel (the MinIO client is thread-safe)
         print(f"\nUploading {len(SAMPLE_MODELS)} sample models...")
-        for model in SAMPLE_MODELS:
-            upload_model(client, model)
-        
-        print("\n" + "=" * 60)
-        print("✓ Initialization complete!")
-        print("=" * 60)
-        print(f"\nUploaded {len(SAMPLE_MODELS)} models to bucket '{MINIO_BUCKET}'")
-        print("\nModel summary:")
+        max_workers = max(1, min(INIT_UPLOAD_CONCURRENCY, len(SAMPLE_MODELS)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(upload_model, client, model, data)
+                for model, data in SAMPLE_PAYLOADS
+            ]
+            for future in futures:
+                future.result()
         
         # Print summary by network type
-        by_type = {}
-        for m in SAMPLE_MODELS:
-            t = m['network_type']
-            by_type[t] = by_type.get(t, 0) + 1
-        
-        for t, count in sorted(by_type.items()):
-            print(f"  - {t}: {count} model(s)")
+        by_type = Counter(m['network_type'] for m in SAMPLE_MODELS)
         
-        print()
+        lines = [
+            "",
+            "=" * 60,
+            "✓ Initialization complete!",
+            "=" * 60,
+            f"\nUploaded {len(SAMPLE_MODELS)} models to bucket '{MINIO_BUCKET}'",
+            "\nModel summary:"
+        ]
+        lines.extend(f"  - {t}: {count} model(s)" for t, count in sorted(by_type.items()))
+        lines.append("")
+        print("\n".join(lines))
         
     except S3Error as e:
         print(f"\n✗ MinIO Error: {e}")
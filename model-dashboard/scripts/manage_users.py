@@ -21,25 +21,41 @@ import os
 import sys
 import argparse
 import sqlite3
+import base64
 import hashlib
-from datetime import datetime
 from pathlib import Path
 
 # Default database path
 DB_PATH = os.getenv('AUTH_DB_PATH', '/data/models/.auth/users.db')
 
+# Shared connection, opened lazily on first use
+_conn = None
+
+# scrypt parameters (must match model_dashboard.auth)
+PASSWORD_SCHEME = 'scrypt'
+SCRYPT_N = 2 ** 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+
 
 def hash_password(password: str) -> str:
-    """Hash a password using SHA-256."""
-    return hashlib.sha256(password.encode('utf-8')).hexdigest()
+    """Hash a password using salted scrypt, stored as 'scrypt$salt$hash' in base64."""
+    salt = os.urandom(16)
+    key = hashlib.scrypt(
+        password.encode('utf-8'),
+        salt=salt,
+        n=SCRYPT_N,
+        r=SCRYPT_R,
+        p=SCRYPT_P,
+        dklen=32
+    )
+    b64salt = base64.b64encode(salt).decode('ascii')
+    b64hash = base64.b64encode(key).decode('ascii')
+    return f'{PASSWORD_SCHEME}${b64salt}${b64hash}'
 
 
-def init_database():
-    """Initialize the database if it doesn't exist."""
-    db_dir = os.path.dirname(DB_PATH)
-    os.makedirs(db_dir, exist_ok=True)
-    
-    conn = sqlite3.connect(DB_PATH)
+def init_database(conn: sqlite3.Connection) -> None:
+    """Create the tables if they don't exist."""
     cursor = conn.cursor()
     
     cursor.execute('''
@@ -68,16 +84,37 @@ def init_database():
         )
     ''')
     
+    # Same index as model_dashboard.auth
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_api_tokens_username_created
+        ON api_tokens (username, created_at DESC)
+    ''')
+    
     conn.commit()
-    conn.close()
+
+
+def get_conn() -> sqlite3.Connection:
+    """Return the shared database connection, initializing it on first use."""
+    global _conn
+    
+    if _conn is None:
+        db_dir = os.path.dirname(DB_PATH)
+        os.makedirs(db_dir, exist_ok=True)
+        
+        _conn = sqlite3.connect(DB_PATH)
+        _conn.execute('PRAGMA journal_mode=WAL')
+        _conn.execute('PRAGMA synchronous=NORMAL')
+        _conn.execute('PRAGMA temp_store=MEMORY')
+        init_database(_conn)
+    
+    return _conn
 
 
 def create_user(username: str, password: str, display_name: str, email: str = '') -> bool:
     """Create a new local user."""
-    init_database()
+    conn = get_conn()
     
     try:
-        conn = sqlite3.connect(DB_PATH)
         cursor = conn.cursor()
         
         password_hash = hash_password(password)
@@ -88,24 +125,23 @@ def create_user(username: str, password: str, display_name: str, email: str = ''
         ''', (username, password_hash, display_name, email))
         
         conn.commit()
-        conn.close()
         
         print(f"✓ Created user: {username}")
         return True
         
     except sqlite3.IntegrityError:
+        conn.rollback()
         print(f"✗ Error: User '{username}' already exists")
         return False
     except Exception as e:
+        conn.rollback()
         print(f"✗ Error creating user: {e}")
         return False
 
 
 def list_users() -> None:
     """List all local users."""
-    init_database()
-    
-    conn = sqlite3.connect(DB_PATH)
+    conn = get_conn()
     cursor = conn.cursor()
     
     cursor.execute('''
@@ -115,15 +151,17 @@ def list_users() -> None:
     ''')
     
     users = cursor.fetchall()
-    conn.close()
     
     if not users:
         print("No users found.")
         return
     
-    print("\n" + "-" * 80)
-    print(f"{'Username':<20} {'Display Name':<25} {'Email':<20} {'Active':<8} {'Created':<12}")
-    print("-" * 80)
+    lines = [
+        "",
+        "-" * 80,
+        f"{'Username':<20} {'Display Name':<25} {'Email':<20} {'Active':<8} {'Created':<12}",
+        "-" * 80
+    ]
     
     for user in users:
         username, display_name, email, is_active, created = user
@@ -131,32 +169,32 @@ def list_users() -> None:
         created_date = created[:10] if created else "N/A"
         email = email or "N/A"
         
-        print(f"{username:<20} {display_name:<25} {email:<20} {status:<8} {created_date:<12}")
+        lines.append(f"{username:<20} {display_name:<25} {email:<20} {status:<8} {created_date:<12}")
+    
+    lines.append("-" * 80)
+    lines.append(f"Total: {len(users)} user(s)")
     
-    print("-" * 80)
-    print(f"Total: {len(users)} user(s)")
+    # Emit the whole table with a single write
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def set_user_status(username: str, active: bool) -> bool:
     """Enable or disable a user."""
-    init_database()
-    
-    conn = sqlite3.connect(DB_PATH)
+    conn = get_conn()
     cursor = conn.cursor()
     
     cursor.execute('''
         UPDATE users 
-        SET is_active = ?, updated_at = ?
+        SET is_active = ?, updated_at = CURRENT_TIMESTAMP
         WHERE username = ?
-    ''', (active, datetime.utcnow().isoformat(), username))
+    ''', (active, username))
     
     if cursor.rowcount == 0:
         print(f"✗ Error: User '{username}' not found")
-        conn.close()
+        conn.rollback()
         return False
     
     conn.commit()
-    conn.close()
     
     status = "enabled" if active else "disabled"
     print(f"✓ User '{username}' has been {status}")
@@ -165,26 +203,23 @@ def set_user_status(username: str, active: bool) -> bool:
 
 def reset_password(username: str, new_password: str) -> bool:
     """Reset a user's password."""
-    init_database()
-    
-    conn = sqlite3.connect(DB_PATH)
+    conn = get_conn()
     cursor = conn.cursor()
     
     password_hash = hash_password(new_password)
     
     cursor.execute('''
         UPDATE users 
-        SET password_hash = ?, updated_at = ?
+        SET password_hash = ?, updated_at = CURRENT_TIMESTAMP
         WHERE username = ?
-    ''', (password_hash, datetime.utcnow().isoformat(), username))
+    ''', (password_hash, username))
     
     if cursor.rowcount == 0:
         print(f"✗ Error: User '{username}' not found")
-        conn.close()
+        conn.rollback()
         return False
     
     conn.commit()
-    conn.close()
     
     print(f"✓ Password reset for user '{username}'")
     return True
@@ -192,11 +227,12 @@ def reset_password(username: str, new_password: str) -> bool:
 
 def delete_user(username: str) -> bool:
     """Delete a user and their API tokens."""
-    init_database()
-    
-    conn = sqlite3.connect(DB_PATH)
+    conn = get_conn()
     cursor = conn.cursor()
     
+    # Take the write lock up front so both deletes commit together
+    cursor.execute('BEGIN IMMEDIATE')
+    
     # Delete API tokens first
     cursor.execute('DELETE FROM api_tokens WHERE username = ?', (username,))
     tokens_deleted = cursor.rowcount
@@ -206,11 +242,10 @@ def delete_user(username: str) -> bool:
     
     if cursor.rowcount == 0:
         print(f"✗ Error: User '{username}' not found")
-        conn.close()
+        conn.rollback()
         return False
     
     conn.commit()
-    conn.close()
     
     print(f"✓ Deleted user '{username}' and {tokens_deleted} API token(s)")
     return True
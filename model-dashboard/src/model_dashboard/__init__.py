@@ -6,48 +6,57 @@ with LDAP/local authentication and REST API access.
 """
 
 import os
+import sys
+import traceback
 import subprocess
 
 __version__ = '2.0.0'
 
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+STREAMLIT_CMD = ['streamlit', 'run', 'app.py']
+
 
 def main() -> None:
-    """Start the Streamlit dashboard."""
-    app_dir = os.path.dirname(os.path.abspath(__file__))
-    subprocess.run(
-        'streamlit run app.py',
-        shell=True,
-        text=True,
-        check=True,
-        cwd=app_dir
-    )
+    """Start the Streamlit dashboard (replaces the current process)."""
+    os.chdir(APP_DIR)
+    os.execvp(STREAMLIT_CMD[0], STREAMLIT_CMD)
 
 
 def run_api() -> None:
     """Start the REST API server."""
-    import uvicorn
-    
-    host = os.getenv('API_HOST', '0.0.0.0')
-    port = int(os.getenv('API_PORT', '8000'))
-    reload = os.getenv('API_RELOAD', 'false').lower() == 'true'
+    from model_dashboard.api import run_api as _run_api
     
-    uvicorn.run(
-        'model_dashboard.api:app',
-        host=host,
-        port=port,
-        reload=reload
-    )
+    _run_api()
 
 
 def run_both() -> None:
     """Start both the dashboard and API server in parallel."""
-    import multiprocessing
+    if sys.platform == 'win32':
+        import multiprocessing
+        
+        api = multiprocessing.Process(target=run_api)
+        api.start()
+        
+        subprocess.run(STREAMLIT_CMD, cwd=APP_DIR)
+        api.join()
+        return
     
-    dashboard = multiprocessing.Process(target=main)
-    api = multiprocessing.Process(target=run_api)
+    # Fork the API server directly (no multiprocessing bootstrap); os._exit
+    # keeps the child from returning into the dashboard code below
+    pid = os.fork()
+    if pid == 0:
+        code = 0
+        try:
+            run_api()
+        except BaseException:
+            traceback.print_exc()
+            code = 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(code)
     
-    dashboard.start()
-    api.start()
+    dashboard = subprocess.Popen(STREAMLIT_CMD, cwd=APP_DIR)
     
-    dashboard.join()
-    api.join()
+    dashboard.wait()
+    os.waitpid(pid, 0)
@@ -4,23 +4,63 @@ Provides a simple API endpoint to list all models.
 """
 
 import os
+import time
+import asyncio
 import logging
+from functools import lru_cache
+from contextlib import asynccontextmanager
 from typing import List, Optional
 
-from fastapi import FastAPI, Depends, HTTPException, Query, status
+import orjson
+from fastapi import FastAPI, Depends, HTTPException, Query, Response, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 
-from model_dashboard.auth import validate_api_token, User
+from model_dashboard.auth import (
+    LAST_USED_FLUSH_INTERVAL,
+    validate_api_token,
+    flush_last_used,
+    hash_token,
+    User
+)
 
 logger = logging.getLogger('model_dashboard.api')
 
+# Seconds to serve the model list from memory before re-listing MinIO
+MODELS_CACHE_TTL = float(os.getenv('API_MODELS_CACHE_TTL', '15'))
+
+# Seconds a validated API token is trusted before re-checking the database
+TOKEN_CACHE_TTL = float(os.getenv('API_TOKEN_CACHE_TTL', '60'))
+TOKEN_CACHE_MAX = 1024
+
+async def _flush_last_used_periodically():
+    """Write buffered token usage on a timer, even when no further requests arrive."""
+    while True:
+        await asyncio.sleep(LAST_USED_FLUSH_INTERVAL)
+        try:
+            await asyncio.to_thread(flush_last_used)
+        except Exception as ex:
+            logger.error(f'Unable to record API token usage: {ex}')
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run the token usage flush timer, and flush once more on shutdown."""
+    task = asyncio.create_task(_flush_last_used_periodically())
+    try:
+        yield
+    finally:
+        task.cancel()
+        flush_last_used()
+
+
 # FastAPI app
 app = FastAPI(
     title="Model Dashboard API",
     description="REST API for accessing model data",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -56,40 +96,63 @@ class ModelsResponse(BaseModel):
 
 
 # Database connection
+@lru_cache(maxsize=1)
 def get_db():
-    """Get database connection."""
-    from model_dashboard.connection import ModelDB
+    """
+    Get the shared database connection.
+    
+    The ModelDB (and its MinIO connection pool) is created once per process
+    and reused across requests.
+    """
+    from model_dashboard.connection import ModelDB, env_opts
     
     opts = {
-        'username': os.getenv('MINIO_USERNAME', 'minioadmin'),
-        'password': os.getenv('MINIO_PASSWORD', 'minioadmin'),
-        'bucket': os.getenv('MINIO_BUCKET', 'argo-models'),
-        'namespace': os.getenv('MINIO_NAMESPACE', 'model-dashboard'),
+        'username': 'minioadmin',
+        'password': 'minioadmin',
+        'bucket': 'argo-models',
+        'namespace': 'model-dashboard',
     }
-    
-    if os.getenv('MINIO_HOST'):
-        opts['host'] = os.getenv('MINIO_HOST')
-    if os.getenv('MINIO_PORT'):
-        opts['port'] = int(os.getenv('MINIO_PORT'))
+    opts.update(env_opts())
     
     return ModelDB(**opts)
 
 
 # Authentication dependency
+_token_cache = {}  # token hash -> (checked_at, user)
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ) -> User:
-    """Validate the API token and return the authenticated user."""
+    """
+    Validate the API token and return the authenticated user.
+    
+    Successful validations are cached for TOKEN_CACHE_TTL seconds, so the
+    auth database is queried at most once per token per interval.
+    Revocations and expiry take effect once the cached entry lapses.
+    """
     token = credentials.credentials
-    success, user, error = validate_api_token(token)
+    key = hash_token(token)
+    
+    now = time.monotonic()
+    cached = _token_cache.get(key)
+    if cached and now - cached[0] < TOKEN_CACHE_TTL:
+        return cached[1]
+    
+    success, user, error = await asyncio.to_thread(validate_api_token, token, key)
     
     if not success:
+        _token_cache.pop(key, None)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=error,
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    if len(_token_cache) >= TOKEN_CACHE_MAX:
+        _token_cache.clear()
+    _token_cache[key] = (now, user)
+    
     return user
 
 
@@ -100,6 +163,54 @@ async def health_check():
     return {"status": "healthy", "message": "API is running"}
 
 
+# Models cache (refreshed at most once per TTL, shared by concurrent requests)
+_models_cache = {'ts': 0.0, 'body': b''}
+_models_lock = asyncio.Lock()
+
+
+def _load_models() -> bytes:
+    """
+    Refresh the models from MinIO and encode the response body (blocking).
+    
+    Rows are built as plain dicts matching ModelInfo rather than ModelInfo
+    instances: the values come from already-validated InferenceModels, so
+    re-validating them per model would only add overhead.
+    """
+    db = get_db()
+    db.update_models()
+    
+    models = []
+    for model in db.model_list:
+        # Get version from inference_information
+        info = model.inference_information
+        version = info.get('version', '') if info else ''
+        
+        # Truncate description for display
+        desc = model.description or ''
+        if len(desc) > 200:
+            desc = desc[:197] + '...'
+        
+        models.append({
+            'name': model.name,
+            'network_type': str(model.network_type),
+            'description': desc,
+            'version': version,
+            'enabled': bool(model.enabled),
+            'alias': model.alias or '',
+            'create_date': model.create_date or '',
+            'last_modified_date': model.last_modified_date or ''
+        })
+    
+    return orjson.dumps({
+        'total': len(models),
+        'models': models
+    })
+
+
+def _cache_expired() -> bool:
+    return time.monotonic() - _models_cache['ts'] >= MODELS_CACHE_TTL
+
+
 # Models endpoint
 @app.get("/api/v1/models", response_model=ModelsResponse, tags=["Models"])
 async def list_models(
@@ -112,36 +223,15 @@ async def list_models(
     Requires Bearer token authentication.
     """
     try:
-        db = get_db()
-        db.update_models()
+        if _cache_expired():
+            async with _models_lock:
+                # Another request may have refreshed while we waited
+                if _cache_expired():
+                    _models_cache['body'] = await asyncio.to_thread(_load_models)
+                    _models_cache['ts'] = time.monotonic()
         
-        models = []
-        for model in db.model_list:
-            # Get version from inference_information
-            version = ''
-            if model.inference_information:
-                version = model.inference_information.get('version', '')
-            
-            # Truncate description for display
-            desc = str(model.description or '')
-            if len(desc) > 200:
-                desc = desc[:197] + '...'
-            
-            models.append(ModelInfo(
-                name=model.name,
-                network_type=str(model.network_type),
-                description=desc,
-                version=version,
-                enabled=model.enabled or False,
-                alias=model.alias or '',
-                create_date=model.create_date or '',
-                last_modified_date=model.last_modified_date or ''
-            ))
-        
-        return ModelsResponse(
-            total=len(models),
-            models=models
-        )
+        # The body is pre-encoded, so bypass response_model serialization
+        return Response(content=_models_cache['body'], media_type='application/json')
         
     except Exception as e:
         logger.error(f"Error retrieving models: {e}")
@@ -158,12 +248,16 @@ def run_api():
     host = os.getenv('API_HOST', '0.0.0.0')
     port = int(os.getenv('API_PORT', 8000))
     reload = os.getenv('API_RELOAD', 'false').lower() == 'true'
+    workers = int(os.getenv('API_WORKERS', '1'))
+    access_log = os.getenv('API_ACCESS_LOG', 'true').lower() == 'true'
     
     uvicorn.run(
         "model_dashboard.api:app",
         host=host,
         port=port,
         reload=reload,
+        workers=1 if reload else workers,
+        access_log=access_log,
         log_level="info"
     )
 
@@ -6,29 +6,64 @@ Uses LDAP authentication with AD group validation and local database fallback.
 
 import os
 import sys
+import queue
+import atexit
 import logging
+from urllib.parse import unquote
+from logging.handlers import (
+    QueueHandler,
+    QueueListener,
+    TimedRotatingFileHandler
+)
+import orjson
 import streamlit as st
 from streamlit_cookies_controller import CookieController
 
 from model_dashboard.connection import MinioConnection
 from model_dashboard.auth import (
+    SESSION_COOKIE_KEY,
     authenticate,
-    User,
-    make_svg_avatar
+    User
 )
 
 LOG_DIR = os.getenv('LOG_DIR', '/data/models/.logs')
 LOG_FILE = os.path.join(LOG_DIR, 'model_dashboard.log')
-os.makedirs(LOG_DIR, exist_ok=True)
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
+
+@st.cache_resource(show_spinner=False)
+def _start_logging() -> QueueListener:
+    """
+    Route log records through a queue to a background listener thread.
+    
+    Callers only enqueue records; the listener owns the stderr and rotating
+    file handlers, so file I/O stays off the session threads. Runs once per
+    process.
+    """
+    os.makedirs(LOG_DIR, exist_ok=True)
+    
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    handlers = [
         logging.StreamHandler(sys.stderr),
-        logging.handlers.TimedRotatingFileHandler(LOG_FILE, when='midnight', delay=True)
+        TimedRotatingFileHandler(LOG_FILE, when='midnight', delay=True)
     ]
-)
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    log_queue = queue.Queue(-1)
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    
+    # Records are formatted by the listener's handlers, not on enqueue
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(message)s',
+        handlers=[QueueHandler(log_queue)]
+    )
+    return listener
+
+
+_start_logging()
 
 logger = logging.getLogger('model_dashboard.app')
 
@@ -39,101 +74,189 @@ st.set_page_config(
 )
 
 # Initialize session state
-if 'logged_in' not in st.session_state:
-    st.session_state.logged_in = False
-if 'user' not in st.session_state:
-    st.session_state.user = None
+st.session_state.setdefault('logged_in', False)
+st.session_state.setdefault('user', None)
 if 'db' not in st.session_state:
+    # st.connection is cached process-wide, so every session shares one ModelDB
     st.session_state.db = st.connection('models', type=MinioConnection)
-if 'login_error' not in st.session_state:
-    st.session_state.login_error = ''
 
-controller = CookieController()
-session_cookie_key = os.getenv('SESSION_COOKIE_KEY', 'model-dashboard-session')
+_controller = None
+
+
+def get_controller() -> CookieController:
+    """
+    Get the cookie controller, rendering its component on first use this run.
+    
+    Only the signed-out path and the sign-out page need cookies, so signed-in
+    reruns of the other pages skip the component round-trip entirely.
+    """
+    global _controller
+    if _controller is None:
+        _controller = CookieController()
+    return _controller
+
+session_cookie_key = SESSION_COOKIE_KEY
+
+
+def _encode_session(data: dict) -> str:
+    """Encode a session cookie payload as compact JSON."""
+    return orjson.dumps(data).decode('utf-8')
+
+
+@st.cache_data(max_entries=1024, ttl=3600, show_spinner=False)
+def _decode_session(raw: str) -> dict:
+    """Decode a session cookie payload (cached by the raw cookie string)."""
+    return orjson.loads(raw)
+
+
+@st.cache_data(max_entries=512, show_spinner=False)
+def _restore_user(
+    username: str,
+    display_name: str,
+    email: str,
+    auth_type: str,
+    groups: tuple
+) -> User:
+    """Build a User from session cookie fields (cached, so the avatar is only rendered once)."""
+    return User(
+        username=username,
+        display_name=display_name,
+        email=email,
+        auth_type=auth_type,
+        groups=list(groups)
+    )
+
+
+def _read_session_cookie():
+    """
+    Read the session cookie, preferring the cookies sent with the page request.
+    
+    st.context.cookies is available without waiting on the cookie component,
+    but it is a snapshot of the initial request: once this session has
+    signed out, only the cookie controller reflects the removal.
+    """
+    if not st.session_state.get('signed_out') and hasattr(st, 'context'):
+        raw = st.context.cookies.get(session_cookie_key)
+        if raw:
+            # The cookie component stores values URI-encoded
+            return unquote(raw)
+    return get_controller().get(session_cookie_key)
 
 
-# Check for existing session
-try:
-    session_data = controller.get(session_cookie_key)
-    if session_data and not st.session_state.logged_in:
+def restore_session() -> None:
+    """Restore a signed-in user from the session cookie, if present."""
+    try:
+        session_data = _read_session_cookie()
+        if not session_data:
+            return
         try:
-            import json
-            user_data = json.loads(session_data) if isinstance(session_data, str) else session_data
-            st.session_state.user = User(
+            user_data = _decode_session(session_data) if isinstance(session_data, str) else session_data
+            restored = _restore_user(
                 username=user_data.get('username', ''),
                 display_name=user_data.get('display_name', ''),
                 email=user_data.get('email', ''),
                 auth_type=user_data.get('auth_type', 'session'),
-                groups=user_data.get('groups', [])
+                groups=tuple(user_data.get('groups') or ())
             )
+            st.session_state.user = restored
             st.session_state.logged_in = True
-            logger.info(f"Session restored for user: {st.session_state.user.username}")
+            logger.info("Session restored for user: %s", restored.username)
         except Exception as e:
-            logger.warning(f"Failed to restore session: {e}")
+            logger.warning("Failed to restore session: %s", e)
             try:
-                controller.remove(session_cookie_key)
+                get_controller().remove(session_cookie_key)
             except:
                 pass
-except TypeError:
-    # Cookie controller not yet initialized, will be available on next rerun
-    pass
-except Exception as e:
-    logger.debug(f"Cookie check error (expected on first load): {e}")
+    except TypeError:
+        # Cookie controller not yet initialized, will be available on next rerun
+        pass
+    except Exception as e:
+        logger.debug("Cookie check error (expected on first load): %s", e)
 
 
+# Check for an existing session (only while signed out, so signed-in reruns
+# never touch the cookie component)
+if not st.session_state.logged_in:
+    restore_session()
+
+
+# Static page styles
+_LOGIN_CSS = """
+<style>
+.login-container {
+    max-width: 400px;
+    margin: 0 auto;
+    padding: 2rem;
+    background: linear-gradient(145deg, #1a1a2e 0%, #16213e 100%);
+    border-radius: 16px;
+    box-shadow: 0 8px 32px rgba(0, 0, 0, 0.3);
+    border: 1px solid rgba(255, 255, 255, 0.1);
+}
+.login-header {
+    text-align: center;
+    margin-bottom: 2rem;
+}
+.login-header h1 {
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    -webkit-background-clip: text;
+    -webkit-text-fill-color: transparent;
+    background-clip: text;
+    font-size: 2.5rem;
+    margin-bottom: 0.5rem;
+}
+.login-header p {
+    color: #a0a0a0;
+    font-size: 1rem;
+}
+.auth-info {
+    background: rgba(102, 126, 234, 0.1);
+    border: 1px solid rgba(102, 126, 234, 0.3);
+    border-radius: 8px;
+    padding: 1rem;
+    margin-bottom: 1rem;
+    font-size: 0.9rem;
+}
+.stButton button {
+    width: 100%;
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    border: none;
+    padding: 0.75rem 1.5rem;
+    font-weight: 600;
+    transition: all 0.3s ease;
+}
+.stButton button:hover {
+    transform: translateY(-2px);
+    box-shadow: 0 8px 25px rgba(102, 126, 234, 0.4);
+}
+</style>
+"""
+
+_LOGOUT_CSS = """
+<style>
+.logout-container {
+    max-width: 450px;
+    margin: 3rem auto;
+    padding: 2rem;
+    text-align: center;
+}
+.logout-icon {
+    font-size: 4rem;
+    margin-bottom: 1rem;
+}
+</style>
+"""
+
+
+@st.fragment
 def login():
-    """Render the login page with LDAP and local authentication options."""
+    """
+    Render the login page with LDAP and local authentication options.
+    
+    Runs as a fragment so submitting the form only reruns this function;
+    the full app is rerun once authentication succeeds.
+    """
     
-    # Custom CSS for login page
-    st.markdown("""
-    <style>
-    .login-container {
-        max-width: 400px;
-        margin: 0 auto;
-        padding: 2rem;
-        background: linear-gradient(145deg, #1a1a2e 0%, #16213e 100%);
-        border-radius: 16px;
-        box-shadow: 0 8px 32px rgba(0, 0, 0, 0.3);
-        border: 1px solid rgba(255, 255, 255, 0.1);
-    }
-    .login-header {
-        text-align: center;
-        margin-bottom: 2rem;
-    }
-    .login-header h1 {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        background-clip: text;
-        font-size: 2.5rem;
-        margin-bottom: 0.5rem;
-    }
-    .login-header p {
-        color: #a0a0a0;
-        font-size: 1rem;
-    }
-    .auth-info {
-        background: rgba(102, 126, 234, 0.1);
-        border: 1px solid rgba(102, 126, 234, 0.3);
-        border-radius: 8px;
-        padding: 1rem;
-        margin-bottom: 1rem;
-        font-size: 0.9rem;
-    }
-    .stButton button {
-        width: 100%;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        border: none;
-        padding: 0.75rem 1.5rem;
-        font-weight: 600;
-        transition: all 0.3s ease;
-    }
-    .stButton button:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 8px 25px rgba(102, 126, 234, 0.4);
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    st.markdown(_LOGIN_CSS, unsafe_allow_html=True)
     
     col1, col2, col3 = st.columns([1, 2, 1])
     
@@ -152,10 +275,8 @@ def login():
         </div>
         """, unsafe_allow_html=True)
         
-        # Display any login errors
-        if st.session_state.login_error:
-            st.error(st.session_state.login_error, icon="🚫")
-            st.session_state.login_error = ''
+        # Login errors are rendered here in the same run as the failed submit
+        error_slot = st.empty()
         
         # Login form
         with st.form("login_form", clear_on_submit=False):
@@ -186,33 +307,31 @@ def login():
             
             if submitted:
                 if not username or not password:
-                    st.session_state.login_error = "Please enter both username and password"
-                    st.rerun()
+                    error_slot.error("Please enter both username and password", icon="🚫")
                 else:
                     with st.spinner("Authenticating..."):
                         success, user, error = authenticate(username, password, auth_type)
                     
                     if success and user:
                         # Store session in cookie
-                        import json
-                        session_data = json.dumps({
+                        session_data = _encode_session({
                             'username': user.username,
                             'display_name': user.display_name,
                             'email': user.email,
                             'auth_type': user.auth_type,
                             'groups': user.groups
                         })
-                        controller.set(session_cookie_key, session_data)
+                        get_controller().set(session_cookie_key, session_data)
                         
                         st.session_state.user = user
                         st.session_state.logged_in = True
                         
-                        logger.info(f'Successfully logged in user: {user.username} (auth_type: {auth_type})')
-                        st.rerun()
+                        logger.info('Successfully logged in user: %s (auth_type: %s)', user.username, auth_type)
+                        # Rerun the whole app so the navigation is rebuilt with the signed-in pages
+                        st.rerun(scope='app')
                     else:
-                        st.session_state.login_error = error or "Authentication failed"
-                        logger.warning(f'Failed login attempt for user: {username} - {error}')
-                        st.rerun()
+                        logger.warning('Failed login attempt for user: %s - %s', username, error)
+                        error_slot.error(error or "Authentication failed", icon="🚫")
         
         st.markdown("---")
         
@@ -227,20 +346,10 @@ def login():
 def logout():
     """Render the logout confirmation page."""
     
-    st.markdown("""
-    <style>
-    .logout-container {
-        max-width: 450px;
-        margin: 3rem auto;
-        padding: 2rem;
-        text-align: center;
-    }
-    .logout-icon {
-        font-size: 4rem;
-        margin-bottom: 1rem;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    # Mount the cookie component before the sign-out click needs it
+    get_controller()
+    
+    st.markdown(_LOGOUT_CSS, unsafe_allow_html=True)
     
     col1, col2, col3 = st.columns([1, 2, 1])
     
@@ -248,8 +357,9 @@ def logout():
         st.markdown('<div class="logout-icon">👋</div>', unsafe_allow_html=True)
         st.header('Sign Out')
         
-        if st.session_state.user:
-            st.markdown(f"**{st.session_state.user.display_name}** ({st.session_state.user.username})")
+        current_user = st.session_state.user
+        if current_user:
+            st.markdown(f"**{current_user.display_name}** ({current_user.username})")
         
         st.markdown("Are you sure you want to sign out?")
         
@@ -261,35 +371,39 @@ def logout():
         
         with col_b:
             if st.button('Sign Out', type='primary', use_container_width=True):
-                username = st.session_state.user.username if st.session_state.user else 'unknown'
-                logger.info(f'User logged out: {username}')
+                username = current_user.username if current_user else 'unknown'
+                logger.info('User logged out: %s', username)
                 
-                controller.remove(session_cookie_key)
-                st.session_state.user = None
-                st.session_state.logged_in = False
+                get_controller().remove(session_cookie_key)
+                st.session_state.update({'user': None, 'logged_in': False, 'signed_out': True})
                 st.rerun()
 
 
-# Page definitions
-login_page = st.Page(login, title='Sign In', icon=':material/login:')
-logout_page = st.Page(logout, title='Sign Out', icon=':material/logout:')
-
-models = st.Page('pages/models.py', title='Dashboard', icon=':material/dashboard:', default=True)
-upload = st.Page('pages/upload.py', title='Upload', icon=':material/upload_file:')
-create = st.Page('pages/create.py', title='Create', icon=':material/post_add:')
-user = st.Page('pages/user.py', title='Profile', icon=':material/account_circle:')
-tokens = st.Page('pages/tokens.py', title='API Tokens', icon=':material/key:')
-
-# Navigation setup
-if st.session_state.logged_in and st.session_state.user:
-    st.logo(st.session_state.user.avatar, size='large')
-    pg = st.navigation(
+def build_navigation(signed_in: bool):
+    """Build the navigation, constructing only the pages for the current auth state."""
+    if not signed_in:
+        return st.navigation([st.Page(login, title='Sign In', icon=':material/login:')])
+    
+    logout_page = st.Page(logout, title='Sign Out', icon=':material/logout:')
+    
+    models = st.Page('pages/models.py', title='Dashboard', icon=':material/dashboard:', default=True)
+    upload = st.Page('pages/upload.py', title='Upload', icon=':material/upload_file:')
+    create = st.Page('pages/create.py', title='Create', icon=':material/post_add:')
+    user = st.Page('pages/user.py', title='Profile', icon=':material/account_circle:')
+    tokens = st.Page('pages/tokens.py', title='API Tokens', icon=':material/key:')
+    
+    return st.navigation(
         {
             'Account': [user, tokens, logout_page],
             'Models': [models, upload, create]
         }
     )
-else:
-    pg = st.navigation([login_page])
 
-pg.run()
\ No newline at end of file
+
+# Navigation setup
+current_user = st.session_state.user if st.session_state.logged_in else None
+if current_user:
+    st.logo(current_user.avatar, size='large')
+
+pg = build_navigation(current_user is not None)
+pg.run()
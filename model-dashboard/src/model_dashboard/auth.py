@@ -5,10 +5,16 @@ Supports LDAP authentication with AD group validation and local database users.
 
 import os
 import re
+import atexit
+import hmac
+import base64
 import hashlib
 import logging
+import time
 import sqlite3
+import threading
 from dataclasses import dataclass
+from functools import lru_cache
 from datetime import datetime, timedelta
 from typing import Optional, Tuple, List
 from pathlib import Path
@@ -26,9 +32,47 @@ LDAP_GROUP_ATTRIBUTE = os.getenv('LDAP_GROUP_ATTRIBUTE', 'memberOf')
 # Local database configuration
 DB_PATH = os.getenv('AUTH_DB_PATH', '/data/models/.auth/users.db')
 
+# Web session settings
+SESSION_COOKIE_KEY = os.getenv('SESSION_COOKIE_KEY', 'model-dashboard-session')
+
 # API token settings
 API_TOKEN_EXPIRY_DAYS = int(os.getenv('API_TOKEN_EXPIRY_DAYS', '30'))
 
+# Buffered api_tokens.last_used_at writes are flushed once this many seconds
+# have passed or this many tokens are pending. Token use checks both; the API
+# also flushes on a timer with this interval and at shutdown
+LAST_USED_FLUSH_INTERVAL = 30
+LAST_USED_FLUSH_MAX = 256
+
+# Password hashing (scrypt) parameters
+PASSWORD_SCHEME = 'scrypt'
+SCRYPT_N = 2 ** 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+
+# Avatar rendering
+_DEFAULT_FONT_FAMILY = ','.join([
+    'HelveticaNeue-Light', 'Helvetica Neue Light', 'Helvetica Neue',
+    'Helvetica', 'Arial', 'Lucida Grande', 'sans-serif',
+])
+_DEFAULT_COLORS = (
+    "#1abc9c", "#16a085", "#f1c40f", "#f39c12", "#2ecc71", "#27ae60",
+    "#e67e22", "#d35400", "#3498db", "#2980b9", "#e74c3c", "#c0392b",
+    "#9b59b6", "#8e44ad", "#bdc3c7", "#34495e", "#2c3e50", "#95a5a6",
+    "#7f8c8d", "#ec87bf", "#d870ad", "#f69785", "#9ba37e", "#b49255",
+)
+
+# Set once the tables have been created in this process
+_DB_READY = False
+
+# Pending last_used_at updates: token hash -> timestamp
+_pending_last_used = {}
+_pending_lock = threading.Lock()
+_last_flush = time.monotonic()
+
+# Per-thread database connections (sqlite3 connections are not shared across threads)
+_pool = threading.local()
+
 
 @dataclass
 class User:
@@ -45,38 +89,27 @@ class User:
             self.groups = []
         if not self.avatar:
             self.avatar = make_svg_avatar(self.display_name)
+        self._items = (
+            ('username', self.username),
+            ('display_name', self.display_name),
+            ('email', self.email),
+            ('auth_type', self.auth_type),
+            ('groups', ', '.join(self.groups) if self.groups else 'N/A')
+        )
     
     def items(self):
-        """Return user attributes as key-value pairs."""
-        return {
-            'username': self.username,
-            'display_name': self.display_name,
-            'email': self.email,
-            'auth_type': self.auth_type,
-            'groups': ', '.join(self.groups) if self.groups else 'N/A'
-        }.items()
+        """Return user attributes as key-value pairs (built once in __post_init__)."""
+        return self._items
 
 
+def _to_style(styles: dict) -> str:
+    return '; '.join([f'{k}: {v}' for k, v in styles.items()])
+
+
+@lru_cache(maxsize=1024)
 def make_svg_avatar(username: str, radius: int = 20, font_size: int = 20, 
                     font_weight: int = 300, opacity: int = 75) -> str:
-    """Create an SVG avatar for a user."""
-    DEFAULT_FONTS = [
-        'HelveticaNeue-Light', 'Helvetica Neue Light', 'Helvetica Neue',
-        'Helvetica', 'Arial', 'Lucida Grande', 'sans-serif',
-    ]
-    DEFAULT_COLORS = [
-        "#1abc9c", "#16a085", "#f1c40f", "#f39c12", "#2ecc71", "#27ae60",
-        "#e67e22", "#d35400", "#3498db", "#2980b9", "#e74c3c", "#c0392b",
-        "#9b59b6", "#8e44ad", "#bdc3c7", "#34495e", "#2c3e50", "#95a5a6",
-        "#7f8c8d", "#ec87bf", "#d870ad", "#f69785", "#9ba37e", "#b49255",
-    ]
-    
-    _to_style = lambda x: '; '.join([f'{k}: {v}' for k, v in x.items()])
-    
-    def _get_color(x):
-        idx = sum(map(ord, x)) % len(DEFAULT_COLORS)
-        return DEFAULT_COLORS[idx]
-    
+    """Create an SVG avatar for a user (cached per name and style)."""
     username = str(username)
     if ' ' in username:
         parts = username.split(' ')
@@ -87,29 +120,50 @@ def make_svg_avatar(username: str, radius: int = 20, font_size: int = 20,
         initials = f'{username[0]}'
     initials = initials.upper()
     
-    color = _get_color(initials)
+    color = _DEFAULT_COLORS[sum(map(ord, initials)) % len(_DEFAULT_COLORS)]
     fill_style = _to_style({'fill': color})
     text_style = _to_style({'font-weight': f'{font_weight}', 'font-size': f'{font_size}px'})
     width = int(radius * 2)
     height = width
-    font_family = ','.join(DEFAULT_FONTS)
+    font_family = _DEFAULT_FONT_FAMILY
     
-    svg = f'<svg xmlns="http://www.w3.org/2000/svg" pointer-events="none" width="{width+4}" height="{height+4}">'
-    svg += f'<circle cx="{radius+1}" cy="{radius+1}" r="{radius}" style="{fill_style}" fill-opacity="{opacity}%" stroke="{color}" stroke-width="1px"/>'
-    svg += '<text text-anchor="middle" y="50%" x="50%" dy="0.35em" '
-    svg += f'pointer-events="auto" fill="#ffffff" font-family="{font_family}" '
-    svg += f'style="{text_style}">{initials}</text></svg>'
-    return svg
+    return ''.join([
+        f'<svg xmlns="http://www.w3.org/2000/svg" pointer-events="none" width="{width+4}" height="{height+4}">',
+        f'<circle cx="{radius+1}" cy="{radius+1}" r="{radius}" style="{fill_style}" fill-opacity="{opacity}%" stroke="{color}" stroke-width="1px"/>',
+        '<text text-anchor="middle" y="50%" x="50%" dy="0.35em" ',
+        f'pointer-events="auto" fill="#ffffff" font-family="{font_family}" ',
+        f'style="{text_style}">{initials}</text></svg>',
+    ])
+
+
+def _get_conn() -> sqlite3.Connection:
+    """Return this thread's database connection, opening it on first use."""
+    conn = getattr(_pool, 'conn', None)
+    if conn is None:
+        conn = sqlite3.connect(DB_PATH)
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA cache_size=-8000')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        _pool.conn = conn
+    return conn
 
 
 def init_database():
-    """Initialize the local user database."""
+    """Initialize the local user database (once per process)."""
+    global _DB_READY
+    if _DB_READY:
+        return
+    
     db_dir = os.path.dirname(DB_PATH)
     os.makedirs(db_dir, exist_ok=True)
     
-    conn = sqlite3.connect(DB_PATH)
+    conn = _get_conn()
     cursor = conn.cursor()
     
+    # WAL is persistent, so setting it once lets readers run alongside
+    # writes and cuts commit fsyncs for every later connection
+    cursor.execute('PRAGMA journal_mode=WAL')
+    
     # Create users table
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS users (
@@ -150,21 +204,86 @@ def init_database():
         )
     ''')
     
+    # Serves list_user_tokens (WHERE username = ? ORDER BY created_at DESC);
+    # token_hash and session_token are already indexed by their UNIQUE constraints
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_api_tokens_username_created
+        ON api_tokens (username, created_at DESC)
+    ''')
+    
     conn.commit()
-    conn.close()
+    _DB_READY = True
     logger.info(f"Database initialized at {DB_PATH}")
 
 
+def _scrypt(password: str, salt: bytes) -> bytes:
+    """Derive a key from a password with scrypt."""
+    return hashlib.scrypt(
+        password.encode('utf-8'),
+        salt=salt,
+        n=SCRYPT_N,
+        r=SCRYPT_R,
+        p=SCRYPT_P,
+        dklen=32
+    )
+
+
 def hash_password(password: str) -> str:
-    """Hash a password using SHA-256."""
-    return hashlib.sha256(password.encode('utf-8')).hexdigest()
+    """Hash a password using salted scrypt, stored as 'scrypt$salt$hash' in base64."""
+    salt = os.urandom(16)
+    b64salt = base64.b64encode(salt).decode('ascii')
+    b64hash = base64.b64encode(_scrypt(password, salt)).decode('ascii')
+    return f'{PASSWORD_SCHEME}${b64salt}${b64hash}'
+
+
+def verify_password(password: str, password_hash: str) -> bool:
+    """
+    Check a password against a stored hash.
+    
+    Accepts 'scrypt$salt$hash' hashes as well as legacy unsalted SHA-256
+    hashes.
+    """
+    if password_hash.startswith(f'{PASSWORD_SCHEME}$'):
+        _, salt, key = password_hash.split('$', 2)
+        computed = _scrypt(password, base64.b64decode(salt))
+        return hmac.compare_digest(computed, base64.b64decode(key))
+    computed = hashlib.sha256(password.encode('utf-8')).hexdigest()
+    return hmac.compare_digest(computed, password_hash)
+
+
+@lru_cache(maxsize=1)
+def _dummy_password_hash() -> str:
+    """A hash of a random password, verified against when a user is not found."""
+    return hash_password(os.urandom(16).hex())
+
+
+def needs_rehash(password_hash: str) -> bool:
+    """Return True if a stored hash predates the current password scheme."""
+    return not password_hash.startswith(f'{PASSWORD_SCHEME}$')
 
 
 def hash_token(token: str) -> str:
-    """Hash an API token using SHA-256."""
+    """
+    Hash an API token using SHA-256.
+    
+    hashlib delegates to OpenSSL, which already uses the CPU's SHA
+    extensions where available.
+    """
     return hashlib.sha256(token.encode('utf-8')).hexdigest()
 
 
+@lru_cache(maxsize=1)
+def _ldap_server():
+    """
+    Get the shared LDAP Server definition.
+    
+    The server info (RootDSE and schema) is read on the first connection and
+    then kept on this object for later logins.
+    """
+    from ldap3 import Server, ALL
+    return Server(LDAP_SERVER, get_info=ALL)
+
+
 def authenticate_ldap(username: str, password: str) -> Tuple[bool, Optional[User], str]:
     """
     Authenticate a user against LDAP and verify group membership.
@@ -174,14 +293,14 @@ def authenticate_ldap(username: str, password: str) -> Tuple[bool, Optional[User
     """
     try:
         import ldap3
-        from ldap3 import Server, Connection, ALL, SUBTREE
+        from ldap3 import Connection, SUBTREE
     except ImportError:
         logger.warning("ldap3 library not installed. LDAP authentication disabled.")
         return False, None, "LDAP authentication is not available"
     
     try:
         # Connect to LDAP server
-        server = Server(LDAP_SERVER, get_info=ALL)
+        server = _ldap_server()
         user_dn = LDAP_USER_DN_TEMPLATE.format(username=username)
         
         conn = Connection(server, user=user_dn, password=password, auto_bind=True)
@@ -244,22 +363,20 @@ def authenticate_local(username: str, password: str) -> Tuple[bool, Optional[Use
         Tuple of (success, user, error_message)
     """
     try:
-        init_database()
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
-        password_hash = hash_password(password)
+        cursor = _get_conn().cursor()
         
         cursor.execute('''
-            SELECT username, display_name, email, is_active 
+            SELECT username, display_name, email, is_active, password_hash
             FROM users 
-            WHERE username = ? AND password_hash = ?
-        ''', (username, password_hash))
+            WHERE username = ?
+        ''', (username,))
         
         result = cursor.fetchone()
-        conn.close()
         
-        if not result:
+        # Unknown users still pay for a full scrypt verify, so response time
+        # does not reveal whether the username exists
+        stored_hash = result[4] if result else _dummy_password_hash()
+        if not verify_password(password, stored_hash) or not result:
             logger.warning(f"Local authentication failed for user: {username}")
             return False, None, "Invalid username or password"
         
@@ -267,6 +384,15 @@ def authenticate_local(username: str, password: str) -> Tuple[bool, Optional[Use
             logger.warning(f"Inactive user attempted login: {username}")
             return False, None, "User account is disabled"
         
+        # Upgrade older hashes now that the plaintext password is known
+        if needs_rehash(result[4]):
+            with _get_conn() as conn:
+                conn.execute('''
+                    UPDATE users SET password_hash = ?, updated_at = CURRENT_TIMESTAMP
+                    WHERE username = ?
+                ''', (hash_password(password), result[0]))
+            logger.info(f"Upgraded password hash for user: {username}")
+        
         user = User(
             username=result[0],
             display_name=result[1],
@@ -311,19 +437,13 @@ def create_local_user(username: str, password: str, display_name: str, email: st
         Tuple of (success, message)
     """
     try:
-        init_database()
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
         password_hash = hash_password(password)
         
-        cursor.execute('''
-            INSERT INTO users (username, password_hash, display_name, email)
-            VALUES (?, ?, ?, ?)
-        ''', (username, password_hash, display_name, email))
-        
-        conn.commit()
-        conn.close()
+        with _get_conn() as conn:
+            conn.execute('''
+                INSERT INTO users (username, password_hash, display_name, email)
+                VALUES (?, ?, ?, ?)
+            ''', (username, password_hash, display_name, email))
         
         logger.info(f"Created local user: {username}")
         return True, "User created successfully"
@@ -336,19 +456,69 @@ def create_local_user(username: str, password: str, display_name: str, email: st
         return False, f"Error creating user: {str(e)}"
 
 
-def validate_api_token(token: str) -> Tuple[bool, Optional[User], str]:
+def flush_last_used() -> None:
+    """Write buffered api_tokens.last_used_at updates in one transaction."""
+    global _pending_last_used, _last_flush
+    
+    with _pending_lock:
+        pending, _pending_last_used = _pending_last_used, {}
+        _last_flush = time.monotonic()
+    
+    if not pending:
+        return
+    
+    try:
+        with _get_conn() as conn:
+            conn.executemany('''
+                UPDATE api_tokens SET last_used_at = ? WHERE token_hash = ?
+            ''', [(ts, token_hash) for token_hash, ts in pending.items()])
+    except Exception as e:
+        logger.error(f"Error updating API token usage: {e}")
+
+
+def _touch_token(token_hash: str, ts: str) -> None:
+    """Record a token use, flushing the buffer when it is due."""
+    with _pending_lock:
+        _pending_last_used[token_hash] = ts
+        due = (
+            len(_pending_last_used) >= LAST_USED_FLUSH_MAX
+            or time.monotonic() - _last_flush >= LAST_USED_FLUSH_INTERVAL
+        )
+    if due:
+        flush_last_used()
+
+
+atexit.register(flush_last_used)
+
+
+def _api_token_user(username: str, display_name: str, email: Optional[str]) -> User:
+    """Build the User for a validated API token."""
+    return User(
+        username=username,
+        display_name=display_name,
+        email=email or '',
+        auth_type='api_token',
+        groups=['api-users']
+    )
+
+
+def validate_api_token(token: str, token_hash: Optional[str] = None) -> Tuple[bool, Optional[User], str]:
     """
     Validate an API token and return the associated user.
     
+    Args:
+        token: The API token
+        token_hash: hash_token(token), if the caller has already computed it
+    
     Returns:
         Tuple of (success, user, error_message)
     """
     try:
-        init_database()
-        conn = sqlite3.connect(DB_PATH)
+        conn = _get_conn()
         cursor = conn.cursor()
         
-        token_hash = hash_token(token)
+        if token_hash is None:
+            token_hash = hash_token(token)
         
         cursor.execute('''
             SELECT t.username, u.display_name, u.email, t.expires_at
@@ -360,32 +530,19 @@ def validate_api_token(token: str) -> Tuple[bool, Optional[User], str]:
         result = cursor.fetchone()
         
         if not result:
-            conn.close()
             return False, None, "Invalid API token"
         
         # Check expiration
+        now = datetime.utcnow()
         if result[3]:
             expires_at = datetime.fromisoformat(result[3])
-            if datetime.utcnow() > expires_at:
-                conn.close()
+            if now > expires_at:
                 return False, None, "API token has expired"
         
-        # Update last used timestamp
-        cursor.execute('''
-            UPDATE api_tokens SET last_used_at = ? WHERE token_hash = ?
-        ''', (datetime.utcnow().isoformat(), token_hash))
-        conn.commit()
-        conn.close()
+        # Update last used timestamp (buffered)
+        _touch_token(token_hash, now.isoformat())
         
-        user = User(
-            username=result[0],
-            display_name=result[1],
-            email=result[2] or '',
-            auth_type='api_token',
-            groups=['api-users']
-        )
-        
-        return True, user, ""
+        return True, _api_token_user(result[0], result[1], result[2]), ""
         
     except Exception as e:
         logger.error(f"API token validation error: {e}")
@@ -402,28 +559,26 @@ def create_api_token(username: str, description: str = '') -> Tuple[bool, str, s
     import secrets
     
     try:
-        init_database()
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
-        # Verify user exists
-        cursor.execute('SELECT username FROM users WHERE username = ? AND is_active = 1', (username,))
-        if not cursor.fetchone():
-            conn.close()
-            return False, '', "User not found or inactive"
-        
         # Generate token
         token = secrets.token_urlsafe(32)
         token_hash = hash_token(token)
         expires_at = (datetime.utcnow() + timedelta(days=API_TOKEN_EXPIRY_DAYS)).isoformat()
         
-        cursor.execute('''
-            INSERT INTO api_tokens (username, token_hash, description, expires_at)
-            VALUES (?, ?, ?, ?)
-        ''', (username, token_hash, description, expires_at))
-        
-        conn.commit()
-        conn.close()
+        with _get_conn() as conn:
+            cursor = conn.cursor()
+            
+            # Take the write lock up front so the check and insert commit together
+            cursor.execute('BEGIN IMMEDIATE')
+            
+            # Verify user exists
+            cursor.execute('SELECT username FROM users WHERE username = ? AND is_active = 1', (username,))
+            if not cursor.fetchone():
+                return False, '', "User not found or inactive"
+            
+            cursor.execute('''
+                INSERT INTO api_tokens (username, token_hash, description, expires_at)
+                VALUES (?, ?, ?, ?)
+            ''', (username, token_hash, description, expires_at))
         
         logger.info(f"Created API token for user: {username}")
         return True, token, "API token created successfully"
@@ -441,21 +596,14 @@ def revoke_api_token(token: str) -> Tuple[bool, str]:
         Tuple of (success, message)
     """
     try:
-        init_database()
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
         token_hash = hash_token(token)
         
-        cursor.execute('DELETE FROM api_tokens WHERE token_hash = ?', (token_hash,))
+        with _get_conn() as conn:
+            cursor = conn.execute('DELETE FROM api_tokens WHERE token_hash = ?', (token_hash,))
         
         if cursor.rowcount == 0:
-            conn.close()
             return False, "Token not found"
         
-        conn.commit()
-        conn.close()
-        
         logger.info("API token revoked")
         return True, "Token revoked successfully"
         
@@ -467,9 +615,7 @@ def revoke_api_token(token: str) -> Tuple[bool, str]:
 def list_user_tokens(username: str) -> List[dict]:
     """List all API tokens for a user (without exposing the actual tokens)."""
     try:
-        init_database()
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
+        cursor = _get_conn().cursor()
         
         cursor.execute('''
             SELECT id, description, expires_at, created_at, last_used_at
@@ -488,7 +634,6 @@ def list_user_tokens(username: str) -> List[dict]:
                 'last_used_at': row[4]
             })
         
-        conn.close()
         return tokens
         
     except Exception as e:
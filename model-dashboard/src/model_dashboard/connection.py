@@ -5,10 +5,17 @@ Provides MinIO-based model storage and retrieval functionality.
 
 import streamlit as st
 
+import os
 import json
+import time
 import logging
+import threading
 from io import BytesIO
+from functools import cache
+from operator import attrgetter
+from concurrent.futures import ThreadPoolExecutor
 from minio import Minio
+from minio.error import S3Error
 from streamlit.connections import BaseConnection
 from typing import (
     Any,
@@ -23,6 +30,38 @@ from model_dashboard.models import (
 
 logging.getLogger('httpx').setLevel(logging.WARNING)
 
+# Concurrent model downloads during a refresh (kept below the MinIO client's
+# default connection pool size of 10)
+UPDATE_WORKERS = 8
+
+# Seconds the dashboard's shared model cache is served before re-reading MinIO
+MODELS_CACHE_TTL = float(os.getenv('MODELS_CACHE_TTL', '60'))
+
+# Environment variable -> (ModelDB option, type)
+_ENV_OPTS = {
+    'MINIO_USERNAME': ('username', str),
+    'MINIO_PASSWORD': ('password', str),
+    'MINIO_BUCKET': ('bucket', str),
+    'MINIO_NAMESPACE': ('namespace', str),
+    'MINIO_HOST': ('host', str),
+    'MINIO_PORT': ('port', int),
+}
+
+
+@cache
+def env_opts() -> Dict[str, Any]:
+    """
+    ModelDB options set through MINIO_* environment variables (read once).
+    
+    Shared by the Streamlit connection and the API so both read the same
+    variables the same way.
+    """
+    return {
+        opt: cast(os.environ[var])
+        for var, (opt, cast) in _ENV_OPTS.items()
+        if os.getenv(var)
+    }
+
 
 class ModelDB:
     """
@@ -38,7 +77,8 @@ class ModelDB:
         bucket: str = 'argo-models',
         namespace: str = 'inference',
         port: int = 9000,
-        host: str = None
+        host: str = None,
+        cache_ttl: float = None
     ):
         """
         Initialize the model database connection.
@@ -50,9 +90,18 @@ class ModelDB:
             namespace: Kubernetes namespace (used for default host)
             port: MinIO server port
             host: MinIO server hostname (optional, defaults to k8s service)
+            cache_ttl: Seconds before the models cache is refreshed on access
+                (optional, defaults to never)
         """
         self._bucket = bucket
         self._models = {}
+        self._etags = {}
+        # (version, models sorted by network type and name)
+        self._sorted = None
+        self._version = 0
+        self._loaded_at = None
+        self._cache_ttl = cache_ttl
+        self._refresh_lock = threading.Lock()
         self.log = logging.getLogger('ModelDB')
         
         if not host:
@@ -66,17 +115,58 @@ class ModelDB:
             cert_check=False
         )
 
+    def _cache_stale(self) -> bool:
+        if self._loaded_at is None:
+            return True
+        if self._cache_ttl is None:
+            return False
+        return time.monotonic() - self._loaded_at >= self._cache_ttl
+
     @property
     def models(self) -> Dict[str, InferenceModel]:
-        """Get dictionary of all models, loading if necessary."""
-        if not self._models:
-            self.update_models()
+        """
+        Get dictionary of all models, loading if necessary.
+        
+        The cache is shared by every session using this ModelDB, so only one
+        caller refreshes it at a time once it is stale. If a refresh fails
+        after a successful load, the stale models keep being served and the
+        next attempt waits another TTL.
+        """
+        if self._cache_stale():
+            with self._refresh_lock:
+                # Another session may have refreshed while we waited
+                if self._cache_stale():
+                    try:
+                        self.update_models()
+                    except Exception as ex:
+                        if self._loaded_at is None:
+                            raise
+                        self.log.error(f'Unable to refresh models, serving cached models: {ex}')
+                        self._loaded_at = time.monotonic()
         return self._models
     
+    @property
+    def version(self) -> int:
+        """Counter bumped whenever the models cache changes."""
+        return self._version
+
     @property
     def model_list(self) -> List[InferenceModel]:
-        """Get sorted list of all models."""
-        return sorted(self.models.values(), key=lambda x: (x.network_type, x.name))
+        """Get sorted list of all models (sorted once per change to the cache)."""
+        self.models  # refresh if stale
+        
+        # Read the version before the models: if another session changes the
+        # cache in between, the newer models are cached under the older
+        # version and simply re-sorted on the next call
+        version = self._version
+        models = self._models
+        cached = self._sorted
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        
+        sorted_models = sorted(models.values(), key=attrgetter('network_type', 'name'))
+        self._sorted = (version, sorted_models)
+        return sorted_models
     
     @property
     def names(self) -> List[str]:
@@ -114,23 +204,58 @@ class ModelDB:
         return objects
     
     def update_models(self) -> None:
-        """Refresh the models cache from MinIO."""
-        self._models = {}
-        for o in self.get_objects():
-            try:
-                network_type, name = o.object_name.split('/')
-                self._models[name] = self.get_model(name, network_type)
-            except Exception:
-                pass
+        """
+        Refresh the models cache from MinIO.
+        
+        Each network type's prefix is listed concurrently. Models whose ETag
+        is unchanged since the last refresh are reused; the rest are
+        downloaded concurrently, and the cache is swapped in once all
+        downloads have finished. The version only changes if a model was
+        added, changed or removed.
+        """
+        models = {}
+        etags = {}
+        with ThreadPoolExecutor(max_workers=UPDATE_WORKERS) as pool:
+            network_types = NetworkType.list()
+            listings = pool.map(lambda nt: self.get_objects(prefix=f'{nt}/'), network_types)
+            
+            keys = []
+            for network_type, objects in zip(network_types, listings):
+                start = len(network_type) + 1
+                for o in objects:
+                    name = o.object_name[start:]
+                    if '/' in name:
+                        continue
+                    etags[o.object_name] = o.etag
+                    cached = self._models.get(name)
+                    if (
+                        cached is not None
+                        and str(cached.network_type) == network_type
+                        and self._etags.get(o.object_name) == o.etag
+                    ):
+                        models[name] = cached
+                    else:
+                        keys.append((name, network_type))
+            
+            results = pool.map(lambda key: self.get_model(*key), keys)
+            for (name, _), model in zip(keys, results):
+                if model is not None:
+                    models[name] = model
+        
+        changed = bool(keys) or models.keys() != self._models.keys()
+        self._models = models
+        self._etags = etags
+        if changed:
+            self._version += 1
+        self._loaded_at = time.monotonic()
 
     def object_exists(self, name: str) -> bool:
         """Check if an object exists in the bucket."""
         try:
             obj = self.client.stat_object(self._bucket, name)
-            assert obj.size
-            return True
         except Exception:
             return False
+        return bool(obj.size)
 
     def get_model(self, name: str, network_type: NetworkType) -> InferenceModel:
         """
@@ -148,10 +273,13 @@ class ModelDB:
         path = f'{network_type}/{name}'
         
         try:
-            assert self.object_exists(path), f'No model found named "{name}" (network_type: {network_type})'
             res = self.client.get_object(self._bucket, path)
-            data = res.read()
-            model = InferenceModel.load(data)
+            model = InferenceModel.load(res.read())
+        except S3Error as ex:
+            if ex.code == 'NoSuchKey':
+                self.log.error(f'No model found named "{name}" (network_type: {network_type})')
+            else:
+                self.log.error(f'Unable to get model "{name}": {ex}')
         except Exception as ex:
             self.log.error(f'Unable to get model "{name}": {ex}')
         finally:
@@ -177,7 +305,7 @@ class ModelDB:
             True if successful
         """
         if isinstance(model, dict):
-            m = InferenceModel(**model)
+            m = InferenceModel.model_validate(model)
         else:
             m = model
 
@@ -209,6 +337,8 @@ class ModelDB:
         self.log.info(txt)
         
         self._models[m.name] = m
+        self._etags[path] = res.etag
+        self._version += 1
         return True
     
     def delete_model(self, name: str, network_type: NetworkType) -> bool:
@@ -230,6 +360,8 @@ class ModelDB:
             
             if name in self._models:
                 del self._models[name]
+                self._version += 1
+            self._etags.pop(path, None)
             
             return True
         except Exception as ex:
@@ -246,8 +378,6 @@ class MinioConnection(BaseConnection[ModelDB]):
     
     def _connect(self, **kwargs) -> ModelDB:
         """Create the database connection."""
-        import os
-        
         # Start with defaults
         opts = {
             'username': 'argo',
@@ -264,18 +394,8 @@ class MinioConnection(BaseConnection[ModelDB]):
             pass
         
         # Environment variables override secrets.toml (highest priority)
-        if os.getenv('MINIO_USERNAME'):
-            opts['username'] = os.getenv('MINIO_USERNAME')
-        if os.getenv('MINIO_PASSWORD'):
-            opts['password'] = os.getenv('MINIO_PASSWORD')
-        if os.getenv('MINIO_BUCKET'):
-            opts['bucket'] = os.getenv('MINIO_BUCKET')
-        if os.getenv('MINIO_NAMESPACE'):
-            opts['namespace'] = os.getenv('MINIO_NAMESPACE')
-        if os.getenv('MINIO_HOST'):
-            opts['host'] = os.getenv('MINIO_HOST')
-        if os.getenv('MINIO_PORT'):
-            opts['port'] = int(os.getenv('MINIO_PORT'))
+        opts.update(env_opts())
+        opts['cache_ttl'] = MODELS_CACHE_TTL
         
         opts.update(kwargs)
-        return ModelDB(**opts)
\ No newline at end of file
+        return ModelDB(**opts)
@@ -1,4 +1,3 @@
-import json
 from enum import Enum
 from pydantic import (
     Field,
@@ -20,8 +19,8 @@ class MinioModel(BaseModel):
     def load(cls,obj:Any) -> Any:
         if isinstance(obj,cls): 
             return obj
-        elif isinstance(obj,bytes):
-            return cls.model_validate(json.loads(obj.decode('utf-8')))
+        elif isinstance(obj,(bytes,bytearray)):
+            return cls.model_validate_json(obj)
         elif isinstance(obj,dict): 
             return cls.model_validate(obj)
         elif hasattr(obj,'model_dump'):
@@ -29,7 +28,9 @@ class MinioModel(BaseModel):
         raise ValueError(f'Unable to convert object of type "{type(obj)}" to "{type(cls)}"')
 
     def to_bytes(self) -> bytes:
-        return self.model_dump_json().encode('utf-8')
+        # The compiled serializer emits UTF-8 bytes directly; model_dump_json()
+        # would decode them to str only for us to encode again
+        return self.__pydantic_serializer__.to_json(self)
 
 class NetworkType(str,Enum):
     nnUNet = 'nnUNet'
@@ -42,7 +43,7 @@ class NetworkType(str,Enum):
 
     @classmethod
     def list(cls):
-        return list(map(lambda c: c.value, cls))
+        return cls._values
 
     def __str__(self) -> str:
         return self.value
@@ -50,14 +51,17 @@ class NetworkType(str,Enum):
     def __repr__(self) -> str:
         return self.value
 
+# Member values, built once for NetworkType.list()
+NetworkType._values = tuple(c.value for c in NetworkType)
+
 class InferenceModel(MinioModel):
     name: str
     network_type: NetworkType
     enabled: Optional[bool] = Field(default=False)
     alias: Optional[str] = Field(default='')
     description: Optional[str] = Field(default='')
-    contour_names: Optional[Dict[Union[int,str],Any]] = Field(default={})
-    inference_information: Optional[Dict[str,Any]] = Field(default={})
+    contour_names: Optional[Dict[Union[int,str],Any]] = Field(default_factory=dict)
+    inference_information: Optional[Dict[str,Any]] = Field(default_factory=dict)
     inference_args: Optional[str] = Field(default='')
     create_date: Optional[str] = Field(default='')
     last_modified_date: Optional[str] = Field(default='')
@@ -69,12 +73,10 @@ class InferenceModel(MinioModel):
         if not self.alias: self.alias = f'{self.name}'
         if not self.inference_args:
             if 'inference_args' in self.inference_information:
-                args = []
-                for key,v in self.inference_information['inference_args'].items():
-                    k = f'{key}' if key.startswith('-') else f'--{key}'
-                    if isinstance(v, bool) and v:
-                        args.append(k)
-                    else:
-                        args.append(f'{k} {v}')
+                args = [
+                    (key if key.startswith('-') else f'--{key}')
+                    + ('' if isinstance(v, bool) and v else f' {v}')
+                    for key,v in self.inference_information['inference_args'].items()
+                ]
                 self.inference_args = ' ' + ' '.join(args)
         return self
\ No newline at end of file
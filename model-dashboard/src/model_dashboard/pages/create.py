@@ -5,12 +5,12 @@ import logging
 from uuid import uuid4
 from model_dashboard.utils import (
     format_error,
-    get_pixel_height
-)
-from model_dashboard.models import (
-    NetworkType,
-    InferenceModel
+    get_text_height,
+    network_type_options,
+    dump_json_text,
+    load_json_text
 )
+from model_dashboard.models import InferenceModel
 
 logger = logging.getLogger('model_dashboard.pages.models')
 
@@ -30,10 +30,7 @@ status_bar = st.progress(st.session_state.status_pct, text='Enter Model Name')
 
 def update_status(pct:int,txt:str) -> None:
     st.session_state.status_pct = pct
-    status_bar.progress(st.session_state.status_pct, text=txt)
-
-def clear_input(key):
-    st.session_state[key] = ''
+    status_bar.progress(pct, text=txt)
 
 name = st.text_input('Name',placeholder='i.e. Task0001_SampleModelName',autocomplete='on',key='create_name')
 derived_from = st.selectbox('Derived From',
@@ -47,11 +44,7 @@ if name:
     if derived_from:
         network_type = st.text_input('Network Type',value=derived_from.network_type,disabled=True,key='create_network')
     else:
-        opts = NetworkType.list()
-        if name.startswith('Task'):
-            opts = ['nnUNet','totalsegmentator','MIST']
-        elif name.startswith('Dataset'):
-            opts = ['nnUNet_v2','TotalSegmentatorV2','MIST']
+        opts = network_type_options(name)
         network_type = st.selectbox('Network Type',opts,index=None)
 
     if network_type:
@@ -68,13 +61,11 @@ if name:
             df = derived_from.model_dump()
             fields.update({k:v for k,v in df.items() if k in fields})
 
-        fields['contour_names'] = json.dumps(fields['contour_names'],indent=4)
-        fields['inference_information'] = json.dumps(fields['inference_information'],indent=4)
+        fields['contour_names'] = dump_json_text(fields['contour_names'])
+        fields['inference_information'] = dump_json_text(fields['inference_information'])
 
         def get_height(value:str|None = None) -> int:
-            v = value or ''
-            n = max(v.count('\n'),10)
-            return get_pixel_height(n,max_lines=15)
+            return get_text_height(value or '',min_lines=11,max_lines=15)
 
         alias = st.text_input('Alias',value=fields['alias'])
         description = st.text_area('Description',value=fields['description'],placeholder='Model description (optional)')
@@ -89,15 +80,15 @@ if name:
                 'network_type': network_type,
                 'alias': alias or name,
                 'description': description or f'{name} ({network_type})',
-                'contour_names': json.loads(contour_names),
-                'inference_information': json.loads(inference_information),
+                'contour_names': load_json_text(contour_names),
+                'inference_information': load_json_text(inference_information),
                 'inference_args': inference_args or ''
             })
 
             logger.info(f'User {username} is adding a model to the database:\n{json.dumps(fields,indent=2)}')
 
             try:
-                m = InferenceModel(**fields)
+                m = InferenceModel.model_validate(fields)
                 db_path = f'{m.network_type}/{m.name}'
                 if overwrite: assert not db.object_exists(db_path), f'Model already exists and overwrite is not set'
                 assert db.add_model(m), 'Database error'
@@ -119,11 +110,12 @@ if name:
             st.session_state.submitted = True
 
         def cancel():
-            st.session_state.submitted = False
-            st.session_state.status_pct = 0
-            for x in ['create_name','create_network']:
-                clear_input(x)
-            st.session_state.create_derived = None
+            ss = st.session_state
+            ss.submitted = False
+            ss.status_pct = 0
+            ss.create_name = ''
+            ss.create_network = ''
+            ss.create_derived = None
 
         c1,c2,c3 = st.columns([0.8,0.1,0.1])
         with c1:
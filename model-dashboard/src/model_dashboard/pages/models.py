@@ -5,12 +5,46 @@ import logging
 import pandas as pd
 from uuid import uuid4
 from model_dashboard.models import InferenceModel
-from model_dashboard.utils import get_pixel_height
+from model_dashboard.utils import (
+    get_text_height,
+    dump_json_text,
+    load_json_text
+)
 
 logger = logging.getLogger('model_dashboard.pages.models')
 
 if 'dfk' not in st.session_state: st.session_state.dfk = str(uuid4())
 
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _build_models_df(_models: dict, version_key: tuple) -> pd.DataFrame:
+    """Build the models table (cached until the model cache changes)."""
+    names, types, descs, versions, created, modified = [], [], [], [], [], []
+    for k,v in _models.items():
+        desc = str(v.description or '')
+        inf_info = v.inference_information or {}
+        if len(desc) > 75:
+            # Cut at the last word boundary that leaves room for the ellipsis
+            cut = desc.rfind(' ', 0, 73)
+            desc = (desc[:cut] if cut > 0 else desc[:72]) + '...'
+        names.append(k)
+        types.append(v.network_type)
+        descs.append(desc)
+        versions.append(inf_info.get("version", ""))
+        created.append(v.create_date)
+        modified.append(v.last_modified_date)
+
+    df = pd.DataFrame({
+        'Name': names,
+        'Network Type': types,
+        'Description': descs,
+        'Version': versions,
+        'create_date': created,
+        'last_modified_date': modified
+    })
+    return df.sort_values(['Network Type','Name'],kind='stable',ignore_index=True)
+
+
 st.header('Current Models')
 st.markdown(f'*Select a model to edit it by clicking the checkbox next to it in the leftmost column*')
 st.divider()
@@ -21,26 +55,10 @@ else:
     db = st.session_state.db._instance
     username = st.session_state.user.username
     
-    models = []
-    for k,v in db.models.items():
-        desc = str(v.description or '')
-        create_date=v.create_date
-        last_modified_date=v.last_modified_date
-        inf_info = v.inference_information or {}
-        version = inf_info.get("version", "")
-        while len(desc) > 75:
-            desc = ' '.join(desc.split(' ')[:-1]) + '...'
-        models.append({
-            'Name': k,
-            'Network Type': v.network_type,
-            'Description': desc,
-            'Version': version,
-            'create_date':create_date,
-            'last_modified_date':last_modified_date
-        })
-    models = sorted(models,key=lambda x: (x['Network Type'],x['Name']))
-
-    df = pd.DataFrame(models)
+    # Keyed by the ModelDB instance and its cache version, so edits made
+    # through any session show up on the next rerun
+    models = db.models
+    df = _build_models_df(models, (id(db), db.version))
 
     event = st.dataframe(
         df,
@@ -57,7 +75,7 @@ else:
         row_id = event.selection.rows[0]
         name = df.iloc[row_id]['Name']
 
-        m = db.models[name].model_dump()
+        m = models[name].model_dump()
 
         st.subheader(name)
 
@@ -65,7 +83,7 @@ else:
             if key not in m: 
                 return val
             elif isinstance(m[key],(list,dict)): 
-                return json.loads(val)
+                return load_json_text(val)
             return m[key].__class__(val)
 
         def update(key:str):
@@ -76,25 +94,28 @@ else:
             if isinstance(v,bool):
                 fields[k] = st.checkbox(k,value=v,key=k,on_change=update,args=(k,))
             elif isinstance(v,(list,dict)):
-                _v = json.dumps(v,indent=4)
-                height = get_pixel_height(_v.count('\n'),max_lines=15)
+                _v = dump_json_text(v)
+                height = get_text_height(_v,max_lines=15)
                 fields[k] = st.text_area(k,value=_v,key=k,height=height,on_change=update,args=(k,))
             else:
                 fields[k] = st.text_input(k,value=v,key=k,on_change=update,args=(k,))
         
         def save():
+            ss = st.session_state
+            state = {k: ss[k] for k in fields}
+            
             updated_model = {}
-            for k in fields:
-                new_val = format_val(k,st.session_state[k])
+            for k,v in state.items():
+                new_val = format_val(k,v)
                 if m[k] != new_val:
                     updated_model[k] = new_val
 
             if updated_model:
-                _updates = json.dumps(updated_model,indent=2,default=lambda x: str(x))
+                _updates = json.dumps(updated_model,indent=2,default=str)
                 logger.info(f'{username} updated model {name}:\n{_updates}')
 
                 updated_model.update({k:v for k,v in m.items() if k not in updated_model})
-                model = InferenceModel(**updated_model)
+                model = InferenceModel.model_validate(updated_model)
                 m_type = model.network_type
                 res = db.add_model(model=model,overwrite=True)
                 if res:
@@ -2,18 +2,25 @@ import streamlit as st
 
 import os
 import json
+import shutil
 import logging
-from io import BytesIO
 from tempfile import mkdtemp
-from zipfile import ZipFile, ZIP_DEFLATED
-from model_dashboard.models import NetworkType
+from zipfile import ZipFile
 from model_dashboard.utils import (
-    get_pixel_height,
-    validate_model_files
+    extract_zip,
+    extract_workers,
+    get_text_height,
+    network_type_options,
+    validate_model_files,
+    dump_json_text,
+    load_json_text
 )
 from datetime import datetime
 
-todays_date = datetime.now().strftime("%-m/%-d/%y")
+def _today_str() -> str:
+    """Today's date as M/D/YY (strftime's %-m/%-d are glibc-only)."""
+    d = datetime.now()
+    return f'{d.month}/{d.day}/{d.year % 100:02d}'
 
 _NETWORK_TYPE_HELP = 'This is to validate the the files imported are in the proper format and that they are saved to the proper paths'
 
@@ -33,17 +40,14 @@ st.divider()
 status_bar = st.progress(0, text='Enter Model Name')
 
 def update_status(pct:int,txt:str) -> None:
-    st.session_state.status_pct = pct or 5
-    status_bar.progress(st.session_state.status_pct, text=txt)
+    pct = pct or 5
+    st.session_state.status_pct = pct
+    status_bar.progress(pct, text=txt)
 
 name = st.text_input('Name',placeholder='i.e. Task0001_SampleModelName',autocomplete='on')
 network_type,nnunet_config,version,upload = ('','','',None)
 if name: 
-    opts = NetworkType.list()
-    if name.startswith('Task'):
-        opts = ['nnUNet','totalsegmentator','MIST']
-    elif name.startswith('Dataset'):
-        opts = ['nnUNet_v2','TotalSegmentatorV2','MIST']
+    opts = network_type_options(name)
 
     network_type = st.selectbox('Network Type',[None,*opts],help=_NETWORK_TYPE_HELP)
     update_status(20,'Choose Network Type')
@@ -85,8 +89,24 @@ if upload is not None:
 
     if len(os.listdir(tmp)) == 0:
         with st.spinner('Extracting files...', show_time=True):
-            z = ZipFile(BytesIO(upload.getvalue()),'r',ZIP_DEFLATED)
-            z.extractall(tmp)
+            # UploadedFile is seekable, so read the archive in place; only
+            # archives large enough for parallel extraction are written to
+            # disk, so each worker process can open them
+            upload.seek(0)
+            with ZipFile(upload) as z:
+                workers = extract_workers(z.infolist())
+                if workers < 2:
+                    z.extractall(tmp)
+            
+            if workers > 1:
+                archive = f'{tmp}.zip'
+                upload.seek(0)
+                with open(archive,'wb') as f:
+                    shutil.copyfileobj(upload,f)
+                try:
+                    extract_zip(archive,tmp,workers)
+                finally:
+                    os.remove(archive)
             
     if not st.session_state.final_info:
         with st.spinner('Validating files...', show_time=True):
@@ -101,8 +121,8 @@ if upload is not None:
         if info:
             update_status(90,'Validate Model Information')
 
-            _info = json.dumps(info,indent=4)
-            height = get_pixel_height(_info.count('\n'),max_lines=20)
+            _info = dump_json_text(info)
+            height = get_text_height(_info,max_lines=20)
             final_info = st.text_area('Validate Model Information',
                                         value=_info,
                                         height=height,
@@ -112,7 +132,7 @@ if upload is not None:
         update_status(95,'Validate Model Information')
 
         _info = st.session_state.final_info
-        height = get_pixel_height(_info.count('\n'),max_lines=20)
+        height = get_text_height(_info,max_lines=20)
         final_info = st.text_area('Validate Model Information',
                                     value=_info,
                                     height=height,
@@ -123,12 +143,13 @@ if upload is not None:
             to_path = st.session_state.to_path
             from_path = st.session_state.from_path
 
-            info = json.loads(st.session_state.final_info)
+            info = load_json_text(st.session_state.final_info)
 
             _info = {k:v for k,v in info.items()}
             _info['from_path'] = from_path
             _info['to_path'] = to_path
             _info = json.dumps(_info,indent=2)
+            todays_date = _today_str()
             info["create_date"]=todays_date
             info["last_modified_date"]=todays_date
             info["inference_information"]["version"]=version
@@ -137,7 +158,11 @@ if upload is not None:
 
             with st.spinner('Saving...', show_time=True):
                 os.makedirs(os.path.dirname(to_path),exist_ok=True)
-                os.system(f'mv {repr(from_path)} {repr(to_path)}')
+                try:
+                    os.replace(from_path,to_path)
+                except OSError:
+                    # /tmp and the model store may be on different filesystems
+                    shutil.move(from_path,to_path)
                 # if tmp: os.system(f'rm -rf {tmp}/*')
 
                 try:
@@ -4,16 +4,15 @@ Displays information about the currently logged-in user.
 """
 
 import streamlit as st
-import pandas as pd
-from model_dashboard.utils import get_pixel_height
 
-if 'user' not in st.session_state or not st.session_state.user:
-    st.switch_page('app.py')
-
-user = st.session_state.user
+# Account type badge by auth_type (anything other than LDAP is a local account)
+_AUTH_BADGES = {
+    'ldap': '<span class="auth-badge auth-ldap">Network (LDAP)</span>',
+    'local': '<span class="auth-badge auth-local">Local Account</span>'
+}
 
-# Page styling
-st.markdown("""
+# Re-emitted on every run: Streamlit drops any element a rerun does not render
+_PROFILE_CSS = """
 <style>
 .profile-header {
     display: flex;
@@ -58,7 +57,25 @@ st.markdown("""
     border: 1px solid rgba(52, 152, 219, 0.4);
 }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+if 'user' not in st.session_state or not st.session_state.user:
+    st.switch_page('app.py')
+
+# Imported after the redirect so unauthenticated hits skip loading pandas
+import pandas as pd
+from streamlit_cookies_controller import CookieController
+from model_dashboard.auth import SESSION_COOKIE_KEY
+from model_dashboard.utils import prettify_label
+
+user = st.session_state.user
+
+# Mount the cookie component before the sign-out click needs it (signed-in
+# runs of the other pages never render it)
+controller = CookieController()
+
+# Page styling
+st.markdown(_PROFILE_CSS, unsafe_allow_html=True)
 
 # Profile header
 c1, c2, c3 = st.columns([0.15, 0.7, 0.15])
@@ -66,9 +83,7 @@ with c1:
     st.image(user.avatar, width=80)
 with c2:
     st.header(user.display_name)
-    auth_class = "auth-ldap" if user.auth_type == "ldap" else "auth-local"
-    auth_label = "Network (LDAP)" if user.auth_type == "ldap" else "Local Account"
-    st.markdown(f'<span class="auth-badge {auth_class}">{auth_label}</span>', unsafe_allow_html=True)
+    st.markdown(_AUTH_BADGES.get(user.auth_type, _AUTH_BADGES['local']), unsafe_allow_html=True)
 with c3:
     pass
 
@@ -77,21 +92,14 @@ st.divider()
 # User details
 st.subheader('Profile Information')
 
-data = []
-for k, v in user.items():
-    if v is not None and str(v):
-        # Format the key nicely
-        label = k.replace('_', ' ').title()
-        data.append({'Field': label, 'Value': str(v)})
+records = ((prettify_label(k), str(v)) for k, v in user.items() if v is not None and str(v))
+df = pd.DataFrame.from_records(records, columns=['Field', 'Value'])
 
-if data:
-    df = pd.DataFrame(data)
-    height = get_pixel_height(len(data), max_lines=15)
+if not df.empty:
     st.dataframe(
         df,
         hide_index=True,
         use_container_width=True,
-        height=height,
         column_config={
             'Field': st.column_config.TextColumn('Field', width='medium'),
             'Value': st.column_config.TextColumn('Value', width='large')
@@ -129,13 +137,7 @@ with st.expander("🔐 Session Information", expanded=False):
     """)
     
     if st.button('Sign Out', key='signout_expander'):
-        from streamlit_cookies_controller import CookieController
-        import os
-        
-        controller = CookieController()
-        session_cookie_key = os.getenv('SESSION_COOKIE_KEY', 'model-dashboard-session')
-        controller.remove(session_cookie_key)
+        controller.remove(SESSION_COOKIE_KEY)
         
-        st.session_state.user = None
-        st.session_state.logged_in = False
+        st.session_state.update({'user': None, 'logged_in': False, 'signed_out': True})
         st.rerun()
@@ -6,8 +6,35 @@ import os
 import sys
 import json
 import traceback
+import multiprocessing
+from collections import deque, defaultdict
+from zipfile import ZipFile
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
 
+import orjson
 
+from model_dashboard.models import NetworkType
+
+# Archives smaller than this (uncompressed) are extracted in-process; below it
+# the cost of starting worker processes outweighs the parallel inflate
+PARALLEL_EXTRACT_MIN_BYTES = 256 * 1024 * 1024
+
+# Upper bound on extraction worker processes. os.cpu_count() reports the
+# host's CPUs, not the container's CPU limit
+EXTRACT_WORKERS = int(os.getenv('EXTRACT_WORKERS', '4'))
+
+# Network types offered for nnUNet v1 ('Task...') and v2 ('Dataset...') model names
+_TASK_OPTS = ('nnUNet', 'totalsegmentator', 'MIST')
+_DATASET_OPTS = ('nnUNet_v2', 'TotalSegmentatorV2', 'MIST')
+
+_NNUNET_TYPES = frozenset(('nnUNet', 'nnUNet_v2'))
+
+# Network types whose models ship an inference_information.json
+_INFERENCE_INFO_TYPES = frozenset(('nnUNet_v2', 'TotalSegmentatorV2'))
+
+
+@lru_cache(maxsize=64)
 def get_pixel_height(
     lines: int,
     min_lines: int = 2,
@@ -17,6 +44,8 @@ def get_pixel_height(
     """
     Calculate pixel height for text areas based on line count.
     
+    Cached, since callers only ever pass a handful of distinct arguments.
+    
     Args:
         lines: Number of lines of content
         min_lines: Minimum lines to display
@@ -30,6 +59,67 @@ def get_pixel_height(
     return max(n * row_height, 68)
 
 
+def get_text_height(text: str, min_lines: int = 2, max_lines: int = 10) -> int:
+    """Calculate pixel height for a text area from its content."""
+    return get_pixel_height(text.count('\n'), min_lines=min_lines, max_lines=max_lines)
+
+
+def network_type_options(name: str) -> tuple:
+    """
+    Network types to offer for a model name.
+    
+    Args:
+        name: Model name
+        
+    Returns:
+        Tuple of network type names
+    """
+    if name.startswith('Task'):
+        return _TASK_OPTS
+    if name.startswith('Dataset'):
+        return _DATASET_OPTS
+    return NetworkType.list()
+
+
+@lru_cache(maxsize=128)
+def prettify_label(key: str) -> str:
+    """Turn a field name like 'display_name' into a label ('Display Name')."""
+    return key.replace('_', ' ').title()
+
+
+def dump_json_text(obj) -> str:
+    """
+    Pretty-print a value as JSON for an editable text area.
+    
+    Uses json rather than orjson, which would silently write NaN and
+    Infinity (accepted by load_json_file) as null and only indents by 2.
+    """
+    return json.dumps(obj, indent=4)
+
+
+def load_json_text(text: str):
+    """Parse JSON entered in a text area (NaN and Infinity included)."""
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        return json.loads(text)
+
+
+def load_json_file(path: str):
+    """
+    Read a JSON file with orjson.
+    
+    Falls back to the json module for files orjson rejects, such as ones
+    containing NaN or Infinity, which json.dump writes by default.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError:
+        return json.loads(data)
+
+
 def format_error(err_str: str = '') -> str:
     """
     Format an exception with full traceback information.
@@ -41,16 +131,14 @@ def format_error(err_str: str = '') -> str:
         Formatted error string with traceback
     """
     try:
-        tb = sys.exc_info()[2]
-        err_msg = '{}'.format(err_str)
-        count = 0
-        for exc_tb in traceback.extract_tb(tb):
-            count += 1
-            fname = exc_tb[0].split('/')[-1]
-            line = exc_tb[1]
-            func = exc_tb[2]
-            err_str = exc_tb[3]
-            err_msg += '\n{}-> ({}, {}, line {}): {}'.format('  ' * count, fname, func, line, err_str)
+        frames = traceback.extract_tb(sys.exc_info()[2])
+        err_msg = ''.join([
+            f'{err_str}',
+            *(
+                f'\n{"  " * i}-> ({os.path.basename(f.filename)}, {f.name}, line {f.lineno}): {f.line}'
+                for i, f in enumerate(frames, 1)
+            )
+        ])
     except Exception as ex:
         if not err_str:
             err_msg = 'There was an error trying to parse the original error: {}'.format(ex)
@@ -59,6 +147,76 @@ def format_error(err_str: str = '') -> str:
     return err_msg
 
 
+def _member_path(dest: str, filename: str) -> str:
+    """Target path of an archive member, sanitized the way ZipFile.extract does."""
+    arcname = os.path.splitdrive(filename.replace('/', os.path.sep))[1]
+    parts = (x for x in arcname.split(os.path.sep) if x not in ('', os.path.curdir, os.path.pardir))
+    return os.path.join(dest, *parts)
+
+
+def _extract_members(path: str, names: list, dest: str) -> None:
+    with ZipFile(path) as z:
+        for n in names:
+            z.extract(n, dest)
+
+
+def extract_workers(infos: list) -> int:
+    """
+    Number of worker processes to extract an archive with.
+    
+    Args:
+        infos: The archive's ZipInfo entries
+        
+    Returns:
+        1 if the archive should be extracted in-process, otherwise the
+        number of processes to pass to extract_zip
+    """
+    if sum(i.file_size for i in infos) < PARALLEL_EXTRACT_MIN_BYTES:
+        return 1
+    if hasattr(os, 'sched_getaffinity'):
+        cpus = len(os.sched_getaffinity(0))
+    else:
+        cpus = os.cpu_count() or 1
+    return max(1, min(EXTRACT_WORKERS, cpus, len(infos)))
+
+
+def extract_zip(path: str, dest: str, workers: int) -> None:
+    """
+    Extract a zip archive across worker processes.
+    
+    Members are split into one size-balanced batch per worker, and each
+    worker opens the archive itself. Parent directories are created up
+    front so workers never race to create the same directory.
+    
+    Args:
+        path: Path to the zip file on disk
+        dest: Directory to extract into
+        workers: Number of worker processes (see extract_workers)
+    """
+    with ZipFile(path) as z:
+        infos = z.infolist()
+        if workers < 2:
+            z.extractall(dest)
+            return
+    
+    for i in infos:
+        target = _member_path(dest, i.filename)
+        os.makedirs(target if i.is_dir() else os.path.dirname(target), exist_ok=True)
+    
+    batches = [[] for _ in range(workers)]
+    sizes = [0] * workers
+    for i in sorted(infos, key=lambda x: x.file_size, reverse=True):
+        n = sizes.index(min(sizes))
+        batches[n].append(i.filename)
+        sizes[n] += i.file_size
+    
+    # spawn rather than fork: the Streamlit server process is multithreaded
+    ctx = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+        for f in [pool.submit(_extract_members, path, b, dest) for b in batches]:
+            f.result()
+
+
 def parse_dataset_json(path: str, n_type: str, name: str = '') -> dict:
     """
     Parse a dataset.json file for model information.
@@ -71,15 +229,27 @@ def parse_dataset_json(path: str, n_type: str, name: str = '') -> dict:
     Returns:
         Dictionary of model information
     """
-    with open(path, 'r') as f:
-        data = json.load(f)
+    return parse_dataset(load_json_file(path), n_type, name=name)
+
+
+def parse_dataset(data: dict, n_type: str, name: str = '') -> dict:
+    """
+    Build model information from already-loaded dataset.json contents.
     
+    Args:
+        data: Parsed dataset.json
+        n_type: Network type
+        name: Model name (optional, uses filename if not provided)
+        
+    Returns:
+        Dictionary of model information
+    """
     labels = data['labels']
     
     if n_type == 'nnUNet':
-        contour_names = {int(k): str(v) for k, v in labels.items() if int(k) > 0}
+        contour_names = {ik: str(v) for k, v in labels.items() if (ik := int(k)) > 0}
     else:
-        contour_names = {}
+        contour_names = defaultdict(list)
         for k, v in labels.items():
             if k.lower() == 'background':
                 continue
@@ -87,11 +257,9 @@ def parse_dataset_json(path: str, n_type: str, name: str = '') -> dict:
                 v = [v]
             for vv in v:
                 vv = int(vv)
-                if not vv:
-                    continue
-                if vv not in contour_names:
-                    contour_names[vv] = []
-                contour_names[vv].append(k)
+                if vv:
+                    contour_names[vv].append(k)
+        contour_names = dict(contour_names)
             
     return {
         'name': data.get('name', name),
@@ -113,11 +281,8 @@ def parse_mist_config(name: str, conf_path: str, model_conf_path: str) -> dict:
     Returns:
         Dictionary of model information
     """
-    with open(conf_path, 'r') as f:
-        conf = json.load(f)
-
-    with open(model_conf_path, 'r') as f:
-        conf['model'] = json.load(f)
+    conf = load_json_file(conf_path)
+    conf['model'] = load_json_file(model_conf_path)
 
     contour_names = conf.pop('final_classes')
     contour_names.pop('background', [])
@@ -133,6 +298,55 @@ def parse_mist_config(name: str, conf_path: str, model_conf_path: str) -> dict:
     }
 
 
+def _find_dir(root: str, name: str) -> str:
+    """Breadth-first search for a directory called name, stopping at the first match."""
+    if os.path.basename(root) == name:
+        return root
+    queue = deque([root])
+    while queue:
+        try:
+            it = os.scandir(queue.popleft())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name == name:
+                        return entry.path
+                    queue.append(entry.path)
+    return None
+
+
+def _find_files(root: str, targets: tuple) -> dict:
+    """
+    Find the first file with each name in targets under root.
+    
+    Each directory's files are checked before its subdirectories, and the
+    search stops as soon as every target has been found.
+    
+    Returns:
+        Dictionary of file name -> path for the targets that were found
+    """
+    found = {}
+    stack = [root]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        subdirs = []
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.name in targets and entry.name not in found:
+                    found[entry.name] = entry.path
+        if len(found) == len(targets):
+            break
+        stack.extend(reversed(subdirs))
+    return found
+
+
 def validate_model_files(
     path: str,
     name: str,
@@ -153,12 +367,7 @@ def validate_model_files(
     Returns:
         Tuple of (info_dict, base_path, output_path, missing_files)
     """
-    base_path = path
-    
-    for root, _, _ in os.walk(path):
-        if os.path.basename(root) == name:
-            base_path = root
-            break
+    base_path = _find_dir(path, name) or path
 
     if nnunet_config: 
         outdir = os.path.join(output_dir, network_type, nnunet_config, name)
@@ -169,17 +378,11 @@ def validate_model_files(
     missing_files = []
     
     if network_type == 'MIST':
-        ds_file, inf_file = ('', '')
-        
-        for root, _, files in os.walk(base_path):
-            if 'config.json' in files:
-                ds_file = os.path.join(root, 'config.json')
-            if 'model_config.json' in files:
-                inf_file = os.path.join(root, 'model_config.json')
-            if all([ds_file, inf_file]):
-                break
-
-        if all([ds_file, inf_file]):
+        found = _find_files(base_path, ('config.json', 'model_config.json'))
+        ds_file = found.get('config.json', '')
+        inf_file = found.get('model_config.json', '')
+
+        if ds_file and inf_file:
             info = parse_mist_config(name, ds_file, inf_file)
         else:
             if not ds_file:
@@ -187,28 +390,21 @@ def validate_model_files(
             if not inf_file:
                 missing_files.append('model_config.json')
 
-    elif network_type in ['nnUNet', 'nnUNet_v2'] or name.startswith(('Task', 'Dataset')):
-        ds_file, inf_file = ('', '')
-        
-        for root, _, files in os.walk(base_path):
-            if 'dataset.json' in files and not ds_file:
-                ds_file = os.path.join(root, 'dataset.json')
-            if 'inference_information.json' in files and not inf_file:
-                inf_file = os.path.join(root, 'inference_information.json')
-            if all([ds_file, inf_file]):
-                break
+    elif network_type in _NNUNET_TYPES or name.startswith(('Task', 'Dataset')):
+        found = _find_files(base_path, ('dataset.json', 'inference_information.json'))
+        ds_file = found.get('dataset.json', '')
+        inf_file = found.get('inference_information.json', '')
             
         if not ds_file:
             missing_files.append('dataset.json')
-        if network_type in ['nnUNet_v2', 'TotalSegmentatorV2'] and not inf_file:
+        if network_type in _INFERENCE_INFO_TYPES and not inf_file:
             missing_files.append('inference_information.json')
 
         if ds_file:
             info = parse_dataset_json(ds_file, network_type, name=name)
-            if network_type in ['nnUNet_v2', 'TotalSegmentatorV2']:
+            if network_type in _INFERENCE_INFO_TYPES:
                 if inf_file:
-                    with open(inf_file, 'r') as f:
-                        info['inference_information'] = json.load(f)
+                    info['inference_information'] = load_json_file(inf_file)
                 else:
                     info['inference_information'] = {}
     else: